@@ -44,3 +44,10 @@ COLOR_TEXT = (255, 255, 255)  # 白色文字
 # UI 参数 (UI Parameters)
 UI_MARGIN = 10
 UI_LINE_HEIGHT = 25
+
+# 录制导出参数 (Frame Export Parameters)
+EXPORT_TICKS = 100000  # 离屏录制的总 tick 数
+EXPORT_FRAME_STRIDE = 10  # 每隔多少 tick 导出一帧
+EXPORT_RESOLUTION = (WINDOW_WIDTH, WINDOW_HEIGHT)  # 输出分辨率 (宽, 高)
+EXPORT_FPS = 30  # 输出视频帧率
+EXPORT_QUEUE_SIZE = 64  # 编码队列最大帧数 (超过时仿真等待编码器)
@@ -17,6 +17,12 @@ class World:
         self.food = np.zeros((GRID_WIDTH, GRID_HEIGHT), dtype=np.int32)
         self.obstacles = np.zeros((GRID_WIDTH, GRID_HEIGHT), dtype=np.bool_)
         
+        # 食物源登记表 (稀疏): {(x, y): {'remaining': 剩余量, 'initial': 初始量}}
+        # 与 self.food 网格保持同步，渲染和统计只需遍历食物源而非整张地图
+        self.food_sources = {}
+        self.total_food = 0  # 所有食物源的剩余食物总量
+        self.depleted_sources = []  # 尚未被取走的耗尽事件 [(x, y, 初始量), ...]
+        
         # 巢穴位置标记
         self.nest_x, self.nest_y = NEST_POSITION
         
@@ -38,7 +44,16 @@ class World:
     def add_food(self, x, y, amount=INITIAL_FOOD_AMOUNT):
         """在指定位置添加食物"""
         if 0 <= x < GRID_WIDTH and 0 <= y < GRID_HEIGHT:
+            # 覆盖已有食物源时先扣除其剩余量
+            old_source = self.food_sources.pop((x, y), None)
+            if old_source is not None:
+                self.total_food -= old_source['remaining']
+            
+            amount = max(0, int(amount))
             self.food[x, y] = amount
+            if amount > 0:
+                self.food_sources[(x, y)] = {'remaining': amount, 'initial': amount}
+                self.total_food += amount
     
     def add_obstacle(self, x, y):
         """在指定位置添加障碍物"""
@@ -55,11 +70,37 @@ class World:
     def pickup_food(self, x, y):
         """从指定位置拾取食物，返回是否成功"""
         if 0 <= x < GRID_WIDTH and 0 <= y < GRID_HEIGHT:
-            if self.food[x, y] > 0:
-                self.food[x, y] -= FOOD_PICKUP_AMOUNT
+            source = self.food_sources.get((x, y))
+            if source is not None:
+                taken = min(FOOD_PICKUP_AMOUNT, source['remaining'])
+                source['remaining'] -= taken
+                self.food[x, y] = source['remaining']
+                self.total_food -= taken
+                
+                # 食物源耗尽：移出登记表并记录事件
+                if source['remaining'] <= 0:
+                    del self.food_sources[(x, y)]
+                    self.depleted_sources.append((x, y, source['initial']))
                 return True
         return False
     
+    def iter_food_sources(self):
+        """
+        遍历所有未耗尽的食物源
+        返回: 迭代器，每项为 (x, y, 剩余量, 初始量)
+        """
+        for (x, y), source in self.food_sources.items():
+            yield x, y, source['remaining'], source['initial']
+    
+    def pop_depleted_sources(self):
+        """
+        取出并清空自上次调用以来耗尽的食物源
+        返回: [(x, y, 初始量), ...]
+        """
+        events = self.depleted_sources
+        self.depleted_sources = []
+        return events
+    
     def deposit_pheromone(self, x, y, amount=PHEROMONE_DEPOSIT):
         """在指定位置释放信息素"""
         if 0 <= x < GRID_WIDTH and 0 <= y < GRID_HEIGHT:
@@ -85,6 +126,9 @@ class World:
         """清空地图（清除所有障碍和食物）"""
         self.food.fill(0)
         self.obstacles.fill(False)
+        self.food_sources.clear()
+        self.total_food = 0
+        self.depleted_sources = []
     
     def deposit_food_at_nest(self):
         """在巢穴存放食物"""
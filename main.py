@@ -2,23 +2,35 @@
 主程序 (Main Program) - 蚁群仿真模拟器
 包含游戏循环、事件处理和渲染
 """
+import argparse
+import os
 import pygame
 import sys
 from config import *
 from entity.world import World
 from entity.ant import Ant
 from utils.draw_utils import *
+from utils.frame_export import FrameExporter, capture_frame, create_offscreen_surface
 
 
 class AntSimulation:
     """蚁群仿真主类"""
     
-    def __init__(self):
-        """初始化游戏"""
+    def __init__(self, headless=False):
+        """
+        初始化游戏
+        :param headless: 是否离屏运行（不打开窗口，用于录制导出）
+        """
         # 初始化 Pygame
-        pygame.init()
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption("🐜 Ant Colony Simulation")
+        if headless:
+            # 无窗口模式：使用 dummy 视频驱动，绘制到离屏表面
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+            pygame.init()
+            self.screen = create_offscreen_surface()
+        else:
+            pygame.init()
+            self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+            pygame.display.set_caption("🐜 Ant Colony Simulation")
         self.clock = pygame.time.Clock()
         
         # 创建世界
@@ -124,6 +136,10 @@ class AntSimulation:
             
             # 信息素挥发
             self.world.evaporate_pheromones()
+            
+            # 处理耗尽的食物源
+            for x, y, initial_amount in self.world.pop_depleted_sources():
+                print(f"Food source at ({x}, {y}) depleted ({initial_amount} collected)")
     
     def render(self):
         """渲染画面"""
@@ -161,12 +177,68 @@ class AntSimulation:
         # 退出
         pygame.quit()
         sys.exit()
+    
+    def run_export(self, exporter, ticks=EXPORT_TICKS, stride=EXPORT_FRAME_STRIDE):
+        """
+        离屏录制循环（不限帧率，尽可能快地运行）
+        :param exporter: FrameExporter 对象
+        :param ticks: 仿真总 tick 数
+        :param stride: 每隔多少 tick 导出一帧
+        """
+        with exporter:
+            for tick in range(ticks):
+                self.update()
+                
+                if tick % stride == 0:
+                    frame = capture_frame(self.screen, self.world, self.ants,
+                                          exporter.resolution)
+                    exporter.submit(frame)
+        
+        print(f"Exported {exporter.frame_count} frames to {exporter.output_path}")
+        pygame.quit()
+
+
+def parse_resolution(text):
+    """解析 WIDTHxHEIGHT 格式的分辨率"""
+    try:
+        width, height = (int(value) for value in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid resolution '{text}', expected WIDTHxHEIGHT")
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError(f"invalid resolution '{text}', width and height must be positive")
+    return width, height
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="Ant Colony Simulation")
+    parser.add_argument('--export', metavar='PATH',
+                        help="离屏录制：输出文件 (如 run.mp4，需要 ffmpeg) 或图片序列目录")
+    parser.add_argument('--ticks', type=int, default=EXPORT_TICKS,
+                        help="录制的仿真 tick 数")
+    parser.add_argument('--stride', type=int, default=EXPORT_FRAME_STRIDE,
+                        help="每隔多少 tick 导出一帧")
+    parser.add_argument('--size', type=parse_resolution, default=EXPORT_RESOLUTION,
+                        help="输出分辨率，如 600x400")
+    parser.add_argument('--fps', type=int, default=EXPORT_FPS,
+                        help="输出视频帧率")
+    return parser.parse_args()
 
 
 def main():
     """程序入口"""
-    simulation = AntSimulation()
-    simulation.run()
+    args = parse_args()
+    
+    if args.export:
+        try:
+            exporter = FrameExporter(args.export, resolution=args.size, fps=args.fps)
+        except RuntimeError as error:
+            sys.exit(f"Export failed: {error}")
+        simulation = AntSimulation(headless=True)
+        simulation.run_export(exporter, ticks=args.ticks, stride=max(1, args.stride))
+    else:
+        simulation = AntSimulation()
+        simulation.run()
 
 
 if __name__ == "__main__":
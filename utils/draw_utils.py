@@ -73,20 +73,18 @@ def draw_food(screen, world):
     绘制食物
     食物量越大，显示越亮
     """
-    for x in range(GRID_WIDTH):
-        for y in range(GRID_HEIGHT):
-            food_amount = world.food[x, y]
-            if food_amount > 0:
-                # 计算食物的大小和亮度
-                size = min(FOOD_SIZE, int((food_amount / INITIAL_FOOD_AMOUNT) * FOOD_SIZE))
-                size = max(2, size)  # 至少显示2像素
-                
-                # 计算屏幕中心位置
-                center_x = x * CELL_SIZE + CELL_SIZE // 2
-                center_y = y * CELL_SIZE + CELL_SIZE // 2
-                
-                # 绘制绿色圆点
-                pygame.draw.circle(screen, COLOR_FOOD, (center_x, center_y), size)
+    # 只遍历食物源登记表，开销取决于食物源数量而非地图面积
+    for x, y, food_amount, initial_amount in world.iter_food_sources():
+        # 计算食物的大小和亮度
+        size = min(FOOD_SIZE, int((food_amount / initial_amount) * FOOD_SIZE))
+        size = max(2, size)  # 至少显示2像素
+        
+        # 计算屏幕中心位置
+        center_x = x * CELL_SIZE + CELL_SIZE // 2
+        center_y = y * CELL_SIZE + CELL_SIZE // 2
+        
+        # 绘制绿色圆点
+        pygame.draw.circle(screen, COLOR_FOOD, (center_x, center_y), size)
 
 
 def draw_nest(screen, world):
@@ -138,6 +136,12 @@ def draw_ui(screen, world, fps, is_paused):
     food_text = font.render(f'Food Collected: {world.collected_food}', True, COLOR_TEXT)
     screen.blit(food_text, (UI_MARGIN, UI_MARGIN + UI_LINE_HEIGHT))
     
+    # 绘制剩余食物总量及食物源数量
+    remaining_text = font.render(
+        f'Food Remaining: {world.total_food} ({len(world.food_sources)} sources)',
+        True, COLOR_TEXT)
+    screen.blit(remaining_text, (UI_MARGIN, UI_MARGIN + UI_LINE_HEIGHT * 2))
+    
     # 如果暂停，显示暂停提示
     if is_paused:
         pause_text = font.render('PAUSED (Press SPACE to continue)', True, (255, 255, 0))
@@ -0,0 +1,235 @@
+"""
+离屏帧导出 (Offscreen Frame Export) - 将仿真画面录制为图片序列或视频
+"""
+import os
+import queue
+import shutil
+import struct
+import subprocess
+import threading
+import zlib
+import pygame
+import numpy as np
+from config import *
+from utils.draw_utils import draw_world, draw_ants
+
+
+# 使用 yuv420p 编码的视频文件扩展名（要求宽高为偶数）
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.mov', '.avi', '.webm')
+
+# 无 ffmpeg 时 PNG 的 zlib 压缩级别（1 最快）
+PNG_COMPRESSION_LEVEL = 1
+
+
+def create_offscreen_surface():
+    """
+    创建离屏绘制表面（不打开窗口）
+    :return: 与窗口同尺寸的 Pygame Surface
+    """
+    return pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+
+
+def capture_frame(surface, world, ants, resolution=EXPORT_RESOLUTION):
+    """
+    将世界和蚂蚁绘制到离屏表面，并转换为原始像素数组
+    :param surface: 离屏 Surface 对象
+    :param world: World 对象
+    :param ants: 蚂蚁列表
+    :param resolution: 输出分辨率 (宽, 高)
+    :return: 形状为 (高, 宽, 3) 的 uint8 数组
+    """
+    draw_world(surface, world)
+    draw_ants(surface, ants)
+    
+    # 按需缩放到输出分辨率
+    if surface.get_size() != tuple(resolution):
+        surface = pygame.transform.smoothscale(surface, resolution)
+    
+    # tobytes 直接按行优先输出 RGB，数组与 Surface 不共享内存，可安全交给后台线程
+    width, height = surface.get_size()
+    data = pygame.image.tobytes(surface, 'RGB')
+    return np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3)
+
+
+class FrameExporter:
+    """
+    后台帧编码器
+    仿真线程通过有界队列提交帧，编码工作交给 ffmpeg 子进程；
+    没有 ffmpeg 时后台线程用 zlib 压缩 PNG（压缩期间释放 GIL）。
+    只有当写出速度落后超过队列长度时仿真才会等待
+    """
+    
+    def __init__(self, output_path, resolution=EXPORT_RESOLUTION, fps=EXPORT_FPS,
+                 queue_size=EXPORT_QUEUE_SIZE):
+        """
+        初始化导出器
+        :param output_path: 输出文件路径 (如 run.mp4、run.gif，由 ffmpeg 编码)
+                            或图片序列目录 (无扩展名)
+        :param resolution: 输出分辨率 (宽, 高)
+        :param fps: 输出视频帧率
+        :param queue_size: 编码队列最大帧数
+        """
+        self.resolution = tuple(resolution)
+        self.fps = fps
+        self.frame_count = 0
+        
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+        self._process = None
+        
+        # 有扩展名的路径交给 ffmpeg 编码，无扩展名的路径视为图片序列目录
+        ext = os.path.splitext(output_path)[1]
+        has_ffmpeg = shutil.which('ffmpeg') is not None
+        if ext and not has_ffmpeg:
+            raise RuntimeError(
+                f"ffmpeg not found, cannot encode '{output_path}'; "
+                f"install ffmpeg or pass a directory path (no extension) to export PNG frames")
+        
+        if ext:
+            self.mode = 'ffmpeg'
+            self.output_path = output_path
+            if ext.lower() in VIDEO_EXTENSIONS:
+                self._round_resolution_to_even()
+            self._process = self._start_ffmpeg(self.output_path, ext.lower() in VIDEO_EXTENSIONS)
+        else:
+            os.makedirs(output_path, exist_ok=True)
+            self.output_path = output_path
+            if has_ffmpeg:
+                # 由 ffmpeg 的 image2 复用器在子进程中编码 PNG
+                self.mode = 'ffmpeg'
+                pattern = os.path.join(output_path, 'frame_%06d.png')
+                self._process = self._start_ffmpeg(pattern, False, ['-f', 'image2', '-start_number', '0'])
+            else:
+                # 没有 ffmpeg：在后台线程中用 zlib 编码 PNG
+                self.mode = 'png'
+        
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        # with 块内已有异常时不再抛出编码器错误，避免覆盖原异常
+        self.close(raise_error=exc_type is None)
+    
+    def _round_resolution_to_even(self):
+        """yuv420p 要求宽高为偶数，向下取整到偶数"""
+        width, height = self.resolution
+        even = (max(2, width - width % 2), max(2, height - height % 2))
+        if even != self.resolution:
+            print(f"Resolution {width}x{height} rounded to {even[0]}x{even[1]} for video encoding")
+            self.resolution = even
+    
+    def _start_ffmpeg(self, target, yuv420p, output_options=()):
+        """
+        启动 ffmpeg 子进程，从标准输入读取原始 RGB 帧
+        :param target: ffmpeg 输出路径或文件名模板
+        :param yuv420p: 是否转换为 yuv420p（兼容常见播放器）
+        :param output_options: 额外的输出参数
+        """
+        width, height = self.resolution
+        command = [
+            'ffmpeg', '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+            '-s', f'{width}x{height}', '-r', str(self.fps),
+            '-i', '-',
+            '-an'
+        ]
+        if yuv420p:
+            command += ['-pix_fmt', 'yuv420p']
+        command += list(output_options)
+        command.append(target)
+        return subprocess.Popen(command, stdin=subprocess.PIPE)
+    
+    def _ffmpeg_exit_error(self):
+        """等待 ffmpeg 退出并返回描述其退出码的异常"""
+        self._process.wait()
+        return RuntimeError(f'ffmpeg exited with code {self._process.returncode}')
+    
+    def submit(self, frame):
+        """
+        提交一帧（队列已满时阻塞，直到编码器腾出空间）
+        :param frame: 形状为 (高, 宽, 3) 的 uint8 数组
+        """
+        if self._error is not None:
+            raise self._error
+        self._queue.put(frame)
+        self.frame_count += 1
+    
+    def close(self, raise_error=True):
+        """
+        等待所有帧写完并关闭编码器
+        :param raise_error: 是否抛出编码过程中记录的错误
+        """
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        
+        if self._process is not None:
+            # ffmpeg 已提前退出时关闭管道会触发 BrokenPipeError，仍需等待进程结束
+            try:
+                self._process.stdin.close()
+            except OSError:
+                pass
+            self._process.wait()
+            if self._process.returncode != 0 and self._error is None:
+                self._error = self._ffmpeg_exit_error()
+            self._process = None
+        
+        if raise_error and self._error is not None:
+            raise self._error
+    
+    def _worker(self):
+        """后台线程：从队列取帧并写出"""
+        index = 0
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                break
+            # 出错后继续消费队列，避免仿真线程阻塞在 put 上
+            if self._error is not None:
+                continue
+            try:
+                self._write_frame(frame, index)
+            except Exception as error:
+                self._error = error
+            index += 1
+    
+    def _write_frame(self, frame, index):
+        """写出单帧"""
+        if self.mode == 'ffmpeg':
+            try:
+                self._process.stdin.write(frame)
+            except BrokenPipeError:
+                raise self._ffmpeg_exit_error() from None
+        else:
+            path = os.path.join(self.output_path, f'frame_{index:06d}.png')
+            with open(path, 'wb') as file:
+                file.write(encode_png(frame))
+
+
+def _png_chunk(chunk_type, data):
+    """构造一个 PNG 数据块（长度 + 类型 + 数据 + CRC）"""
+    return (struct.pack('>I', len(data)) + chunk_type + data
+            + struct.pack('>I', zlib.crc32(chunk_type + data)))
+
+
+def encode_png(frame, level=PNG_COMPRESSION_LEVEL):
+    """
+    将 RGB 数组编码为 PNG 字节
+    zlib 压缩大块数据时会释放 GIL，适合在后台线程中调用
+    :param frame: 形状为 (高, 宽, 3) 的 uint8 数组
+    :param level: zlib 压缩级别
+    :return: PNG 文件内容
+    """
+    height, width = frame.shape[:2]
+    # 每行前加一个过滤类型字节 (0 = None)
+    rows = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    rows[:, 1:] = frame.reshape(height, width * 3)
+    
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n'
+            + _png_chunk(b'IHDR', header)
+            + _png_chunk(b'IDAT', zlib.compress(rows.tobytes(), level))
+            + _png_chunk(b'IEND', b''))